@@ -4,11 +4,21 @@
 #
 #!/usr/bin/env python3
 
+import atexit
+import functools
+import itertools
+import shutil
 import subprocess
 import time
 from datetime import datetime
 import os
+import math
+import re
+import select
+import signal
 import sys
+import queue
+import threading
 
 # ============================================================================
 # GLOBAL SETTINGS
@@ -17,6 +27,255 @@ import sys
 LOG_DIR = "logs_stb"
 os.makedirs(LOG_DIR, exist_ok=True)
 
+# ADB executable, resolved once instead of searching PATH on every call
+ADB = shutil.which("adb") or "adb"
+
+# Marker echoed after each command sent through the persistent ADB shell.
+# The echo command splits it with empty quotes, so an echoed command line
+# (PTY-backed shells) never matches the marker itself.
+SHELL_SENTINEL = "__DONE__"
+SHELL_SENTINEL_CMD = 'echo __DO""NE__$?'
+
+# Seconds allowed per keyevent and for adb connect/devices before giving up
+KEY_TIMEOUT = 3
+CONNECT_TIMEOUT = 10
+
+# Background log writer: max lines per write, max seconds a line waits to be written
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 1.0
+
+# Standby polling backoff in seconds (doubles from MIN up to MAX)
+STANDBY_POLL_MIN = 2
+STANDBY_POLL_MAX = 30
+
+# Seconds a device readiness result is reused
+READY_CACHE_TTL = 2.0
+
+# Seconds between background connection probes (adb get-state), between
+# background standby probes (dumpsys power) and allowed per probe
+WATCHDOG_INTERVAL = 1
+STANDBY_CHECK_INTERVAL = 10
+WATCHDOG_TIMEOUT = 5
+
+# Foreground window probe and polling interval used instead of fixed waits
+FOCUS_PROBE = "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+POLL_INTERVAL = 0.5
+# Longest wait for the focus to move after a key (the fixed pause it replaces)
+FOCUS_CHANGE_TIMEOUT = 5.0
+
+# Keys: name -> (Android key code, delay in seconds, delay applied "pre" or "post" key)
+KEY_TABLE = {
+    "HOME": ("3", 10, "post"),
+    "RIGHT": ("22", 5, "post"),
+    "LEFT": ("21", 5, "post"),
+    "DOWN": ("20", 5, "post"),
+    "UP": ("19", 5, "post"),
+    "OK": ("23", 5, "post"),
+    "BACK": ("4", 10, "pre"),
+    "LIVE": ("170", 5, "post"),
+    "GUIDE": ("172", 5, "pre"),
+    "CHANNEL_UP": ("166", 20, "pre"),
+    "CHANNEL_DOWN": ("167", 20, "pre"),
+    "VOLUME_UP": ("24", 3, "post"),
+    "VOLUME_DOWN": ("25", 3, "post"),
+    "MUTE": ("164", 5, "post"),
+    "STANDBY": ("26", 10, "post"),
+    "WAKEUP": ("224", 20, "post"),
+}
+
+# Key code -> KEY_TABLE name, for batches given as integer key codes
+KEY_BY_CODE = {int(code): name for name, (code, _, _) in KEY_TABLE.items()}
+
+# Key injection tools: "cmd input" talks to the running input service (Android 10+),
+# "input" starts a new app_process on the STB for every key
+INPUT_TOOLS = ("cmd input", "input")
+INPUT_PROBE = "cmd input 2>&1 | grep -q keyevent"
+
+# Prebuilt single key commands per tool, so sending a key doesn't format a new string
+_KEY_CMDS = {tool: {name: f"{tool} keyevent {code}" for name, (code, _, _) in KEY_TABLE.items()}
+             for tool in INPUT_TOOLS}
+
+# Navigation key codes used in navigation sequences
+KEY_HOME, KEY_BACK, KEY_OK = 3, 4, 23
+KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT = 19, 20, 21, 22
+
+# Max keys sent in one batched shell call between standby/connection checks
+NAV_BATCH_SIZE = 10
+
+# CEC disable methods: (shell command, success log, failure log)
+CEC_METHODS = [
+    # Method 1: Traditional global settings (Android 13 and below)
+    ("settings put global hdmi_control_enabled 0",
+     "Method 1: Global HDMI control disabled", "Method 1: Global HDMI control - FAILED"),
+    ("settings put global hdmi_volume_use_cec 0",
+     "Method 1: Global HDMI volume CEC disabled", "Method 1: Global HDMI volume CEC - FAILED"),
+    # Method 2: Secure settings (Android 14)
+    ("settings put secure hdmi_control_enabled 0",
+     "Method 2: Secure HDMI control disabled", "Method 2: Secure HDMI control - FAILED"),
+    ("settings put secure hdmi_volume_use_cec 0",
+     "Method 2: Secure HDMI volume CEC disabled", "Method 2: Secure HDMI volume CEC - FAILED"),
+    # Method 3: System settings (Android 14)
+    ("settings put system hdmi_control_enabled 0",
+     "Method 3: System HDMI control disabled", "Method 3: System HDMI control - FAILED"),
+    # Method 4: Direct property setting (Android 14)
+    ("setprop ro.hdmi.device_type 0",
+     "Method 4: HDMI device type property disabled", "Method 4: HDMI device type property - FAILED"),
+    # Method 5: CEC service control (Android 14)
+    ("cmd hdmi_control cec_setting --enabled false",
+     "Method 5: CEC service control disabled", "Method 5: CEC service control - FAILED"),
+    # Method 6: Alternative CEC disable (Android 14)
+    ("settings put global hdmi_cec_enabled 0",
+     "Method 6: Alternative CEC setting disabled", "Method 6: Alternative CEC setting - FAILED"),
+    # Method 7: TV input service (Android 14)
+    ("settings put secure tv_input_hidden_inputs 1",
+     "Method 7: TV input service configured", "Method 7: TV input service - FAILED"),
+]
+
+# Banner frame lines
+_BAR = "=" * 60
+_MENU_BAR = "=" * 50
+
+def _format_banner(title, lines, footer=None, bar=_BAR, end="\n"):
+    """
+    Build the text of a framed banner.
+    
+    Args:
+        title (str): Banner title
+        lines (list): Body lines
+        footer (str): Optional line below the body, framed by its own bar
+        bar (str): Frame line
+        end (str): Text added after the closing bar
+        
+    Returns:
+        str: Banner text
+    """
+    text = f"\n{bar}\n{title}\n{bar}\n" + "".join(f"{line}\n" for line in lines) + bar
+    if footer:
+        text += f"\n{footer}\n{bar}"
+    return text + end
+
+def _print_banner(title, lines, footer=None, bar=_BAR, end="\n"):
+    """Write a framed banner to stdout with a single write and flush (see _format_banner)"""
+    sys.stdout.write(_format_banner(title, lines, footer, bar, end))
+    sys.stdout.flush()
+
+# One-line notice for tests started outside a 'screen' session
+_SCREEN_REQUIRED = "ERROR: not in a 'screen' session (use: screen -S [SessionName])\n"
+
+# GNU screen exports STY in its sessions; the environment doesn't change while running
+_IN_SCREEN = "STY" in os.environ
+
+# Windows 10+ consoles honor ANSI escapes once VT processing is enabled,
+# which an empty os.system call does as a side effect
+if os.name == "nt":
+    os.system("")
+
+# ANSI erase display + cursor home
+_CLEAR_SEQ = "\033[2J\033[H"
+
+def _clear():
+    """Clear the terminal with an ANSI escape instead of spawning cls/clear"""
+    sys.stdout.write(_CLEAR_SEQ)
+    sys.stdout.flush()
+
+def _prompt(prompt):
+    """
+    Read one menu answer, waiting in select() instead of input()'s readline
+    so Ctrl-C is handled as soon as it arrives.
+    Windows can't select() on stdin, so it keeps using input(); piped stdin
+    skips the select since readline may already hold the next lines buffered.
+    
+    Args:
+        prompt (str): Text shown before the answer
+        
+    Returns:
+        str: Stripped answer
+    """
+    if os.name == "nt":
+        return input(prompt).strip()
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    if sys.stdin.isatty():
+        select.select([sys.stdin], [], [])
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
+def _write_raw(data):
+    """
+    Write pre-encoded bytes straight to the stdout descriptor, bypassing
+    the sys.stdout text layer. Pending sys.stdout text is flushed first,
+    so the output order is kept.
+    
+    Args:
+        data (bytes): Encoded text
+    """
+    sys.stdout.flush()
+    view = memoryview(data)
+    while view:
+        view = view[os.write(sys.stdout.fileno(), view):]
+
+# Menus never change: rendered and encoded once, written with one call (ASCII only)
+_MAIN_MENU = (_CLEAR_SEQ + _format_banner("STB TEST SUITE - SELECT PROJECT", [
+    "1 - Project 1",
+    "2 - Project 2",
+    "3 - Project 3",
+    "0 - Exit (quit)",
+], bar=_MENU_BAR)).encode("ascii")
+_PROJECT_MENUS = {project_id: _format_banner(f"PROJECT {project_id} - AVAILABLE TESTS", [
+    "1 - Zapping",
+    "2 - Navigation",
+    "3 - Apps",
+    "4 - StandbyWakeup",
+    "5 - Volume Control",
+    "0 - Back to main menu",
+], bar=_MENU_BAR).encode("ascii") for project_id in (1, 2, 3)}
+
+@functools.lru_cache(maxsize=None)
+def _build_key_script(names, tool="input"):
+    """
+    Build the shell script for a key sequence, cached per sequence.
+    Key delays run on the device and runs of the same key become one loop.
+    
+    Args:
+        names (tuple): Key names in KEY_TABLE, in sending order
+        tool (str): Key injection tool from INPUT_TOOLS
+        
+    Returns:
+        tuple: (shell script, log label, timeout in seconds)
+    """
+    cmds = _KEY_CMDS[tool]
+    steps = []
+    labels = []
+    total_delay = 0
+    for name, run in itertools.groupby(names):
+        count = len(list(run))
+        _, delay, when = KEY_TABLE[name]
+        if when == "pre":
+            step = f"sleep {delay} && {cmds[name]}"
+        else:
+            step = f"{cmds[name]} && sleep {delay}"
+        if count > 1:
+            # Subshell, so a failed key ends the loop without closing the ADB shell
+            step = f"(for i in $(seq 1 {count}); do {step} || exit 1; done)"
+            labels.append(f"KEY_{name} x{count}")
+        else:
+            labels.append(f"KEY_{name}")
+        steps.append(step)
+        total_delay += delay * count
+    return " && ".join(steps), ", ".join(labels), total_delay + KEY_TIMEOUT * len(names)
+
+def requires_screen_session(fn):
+    """Run a test method only inside a 'screen' session, else show a notice"""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if not self._has_screen:
+            self._print_screen_required()
+            return None
+        return fn(self, *args, **kwargs)
+    return wrapper
+
 # ============================================================================
 # MAIN CLASS - STB TESTER
 # ============================================================================
@@ -26,6 +285,137 @@ class STBTester:
     Main class for Android STB testing via ADB.
     Organizes all tests by project configuration.
     """
+
+    # Standby markers in "dumpsys power" output, matched on raw bytes
+    _STANDBY_RE = re.compile(rb"mWakefulness=(?:asleep|dozing)|display power: state=off", re.I)
+
+    # Last formatted log timestamp, reused while the second doesn't change
+    _ts_sec = 0
+    _ts_str = ""
+
+    # Volume test cycle: UP x5, DOWN x5, MUTE on/off, UP x3, DOWN x3, MUTE on/off
+    _VOL_SEQ = (("VOLUME_UP",) * 5 + ("VOLUME_DOWN",) * 5 + ("MUTE",) * 2
+                + ("VOLUME_UP",) * 3 + ("VOLUME_DOWN",) * 3 + ("MUTE",) * 2)
+
+    # Navigation sequences: key codes, or names of methods taking a device
+    _NAV_SEQ_P1 = (
+        KEY_HOME,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_UP, KEY_UP, KEY_UP, KEY_UP,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_DOWN, KEY_RIGHT,
+        KEY_UP, KEY_LEFT, KEY_HOME,
+        KEY_UP, KEY_RIGHT, KEY_OK,
+        KEY_DOWN, KEY_DOWN, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_UP, KEY_UP, KEY_UP,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_HOME, KEY_UP, KEY_RIGHT, KEY_RIGHT, KEY_OK,
+        KEY_DOWN, KEY_DOWN, KEY_RIGHT, KEY_RIGHT,
+        KEY_UP, KEY_UP, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_HOME,
+    )
+    _NAV_SEQ_P2 = (
+        KEY_HOME, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_UP, KEY_UP, KEY_UP, KEY_UP,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_OK,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_UP,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_LEFT, KEY_LEFT,
+        KEY_UP,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_UP, KEY_LEFT, KEY_OK,
+        KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN,
+        KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN,
+    )
+    _NAV_SEQ_P3 = (
+        KEY_HOME, KEY_HOME,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_HOME, KEY_UP, KEY_RIGHT, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_HOME, KEY_UP, KEY_RIGHT, KEY_RIGHT, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        "_send_flow_with_navigation",
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_DOWN, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_BACK,
+        KEY_RIGHT,
+        KEY_OK,
+        KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN,
+        KEY_DOWN, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_UP, KEY_UP, KEY_UP, KEY_UP, KEY_UP,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_BACK,
+        KEY_RIGHT, KEY_OK,
+        KEY_DOWN, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_BACK,
+        KEY_RIGHT, KEY_OK,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_BACK, KEY_OK,
+        KEY_DOWN, KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_DOWN,
+        KEY_RIGHT, KEY_RIGHT, KEY_RIGHT,
+        KEY_BACK,
+        KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT, KEY_LEFT,
+        KEY_OK,
+    )
     
     def __init__(self):
         """Initialize class variables"""
@@ -33,7 +423,80 @@ class STBTester:
         self.ip = None
         self.port = 5555
         self.log_path = None
+        self._log_fd = None
         self.error_already_shown = False
+        self._adb_prefix = None
+        self._shell = None
+        self._shell_lines = None
+        self._ready_cache = (0.0, False)
+        self._input_tool = "input"
+        self._key_cmds = _KEY_CMDS["input"]
+        # Label of the last key script sent, None once anything else may have moved the UI
+        self._last_key = None
+        # Serializes commands sent through the persistent shell
+        self._shell_lock = threading.RLock()
+        self._alive = threading.Event()
+        self._standby = threading.Event()
+        self._watchdog = None
+        self._watchdog_stop = threading.Event()
+        # Test deadline flag, set by SIGALRM or a timer thread (see _start_deadline)
+        self._expired = False
+        self._deadline_timer = None
+        self._APP_OPENERS = (self._open_netflix, self._open_amazon, self._open_youtube,
+                             self._open_disney, self._open_spotify, self._open_max)
+        # Whole volume cycle in one shell call, delays run on the device
+        self._volume_cycle = functools.partial(self.f_send_sequence, self._VOL_SEQ)
+        self._log_q = queue.Queue()
+        # Error-display pauses only make sense when someone is watching
+        self.interactive = sys.stdin.isatty()
+        self._has_screen = _IN_SCREEN
+        threading.Thread(target=self._log_worker, daemon=True).start()
+        atexit.register(self.f_close_log)
+
+    def _pause(self, seconds):
+        """
+        Hold an error or summary message on screen in interactive mode.
+        
+        Args:
+            seconds (int): Pause length, skipped when stdin is not a terminal
+        """
+        if self.interactive:
+            time.sleep(seconds)
+
+    def _penalty_wait(self, seconds=10):
+        """
+        Count down before returning to the menu, Enter skips the wait.
+        Falls back to a plain pause where stdin can't be polled (Windows).
+        
+        Args:
+            seconds (int): Countdown length, skipped when stdin is not a terminal
+        """
+        if not self.interactive:
+            return
+        if os.name == "nt":
+            time.sleep(seconds)
+            return
+        end = time.monotonic() + seconds
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            sys.stdout.write(f"\r {math.ceil(remaining)}s... (press Enter to skip) ")
+            sys.stdout.flush()
+            ready, _, _ = select.select([sys.stdin], [], [], min(0.5, remaining))
+            if ready:
+                sys.stdin.readline()
+                break
+        sys.stdout.write("\n")
+
+    def _print_screen_required(self):
+        """
+        Tell the user that tests must run inside a 'screen' session.
+        Writes one line to stderr and returns at once - there is no 10 second
+        banner pause, so scripted runs and retries aren't held up.
+        """
+        sys.stderr.write(_SCREEN_REQUIRED)
+        sys.stderr.flush()
 
     # ========================================================================
     # LOGGING SYSTEM
@@ -54,49 +517,88 @@ class STBTester:
 
             # Check characters limit
             if len(log_name) > 50:
-                print("\n" + "="*60)
-                print("LOG NAME TOO LONG")
-                print("="*60)
-                print(f"• Current length: {len(log_name)} characters")
-                print("• Use a shorter name")
-                print("="*60)
-                print("Returning to menu in 10 seconds...")
-                print("="*60)
-                time.sleep(5)
-                os.system("cls" if os.name == "nt" else "clear")
+                _print_banner("LOG NAME TOO LONG", [
+                    f"• Current length: {len(log_name)} characters",
+                    "• Use a shorter name",
+                ], "Returning to menu in 10 seconds...")
+                self._pause(5)
+                _clear()
                 return False
 
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
             log_filename = f"{log_name}_{timestamp}.txt"
             self.log_path = os.path.join(LOG_DIR, log_filename)
+            self.f_close_log()
+            self._log_fd = os.open(self.log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
             return True
     
         except Exception as e:
-            print("\n" + "="*60)
-            print("LOG SETUP ERROR")
-            print("="*60)
-            print("• Failed to setup logging")
-            print("• Log name must be max 50 characters")
-            print("="*60)
-            print("Returning to menu in 5 seconds...")
-            print("="*60)
-            time.sleep(5)
-            os.system("cls" if os.name == "nt" else "clear")
+            _print_banner("LOG SETUP ERROR", [
+                "• Failed to setup logging",
+                "• Log name must be max 50 characters",
+            ], "Returning to menu in 5 seconds...")
+            self._pause(5)
+            _clear()
             return False
 
-    def f_log(self, msg):
+    def f_log(self, msg, *args):
         """
         Log function - writes into the console all interactions.
         
         Args:
-            msg (str): Message to log
+            msg (str): Message to log, %-style format when args are given
+            *args: Values formatted into msg
+        """
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+        if args:
+            msg = msg % args
+        line = f"[{self._ts_str}] {msg}\n"
+        sys.stdout.write(line)
+        if self._log_fd is not None:
+            self._log_q.put(line)
+
+    def _log_worker(self):
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        line = f"[{timestamp}] {msg}"
-        print(line)
-        if self.log_path:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+        Background thread - writes queued log lines to the log file in batches.
+        Lines are collected for up to LOG_FLUSH_INTERVAL seconds or LOG_BATCH_SIZE
+        lines, then written with one call. None in the queue forces the write.
+        """
+        # Local names for the worker loop below
+        get_line, monotonic = self._log_q.get, time.monotonic
+        while True:
+            batch = [get_line()]
+            end = monotonic() + LOG_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < LOG_BATCH_SIZE:
+                remaining = end - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(get_line(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                if self._log_fd is not None:
+                    os.write(self._log_fd, "".join(filter(None, batch)).encode("utf-8"))
+            except Exception as e:
+                print(f"Error writing log file: {e}")
+            finally:
+                for _ in batch:
+                    self._log_q.task_done()
+
+    def f_flush_log(self):
+        """Write all queued log lines to the log file now and wait for it"""
+        self._log_q.put(None)
+        self._log_q.join()
+
+    def f_close_log(self):
+        """Write pending log lines and close the current log file"""
+        self.f_flush_log()
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
 
     # ========================================================================
     # ADB CONNECTION AND COMMUNICATION
@@ -108,52 +610,37 @@ class STBTester:
         Displays in a formatted table.
         """
         try:
-            result = subprocess.run(["adb", "devices"], check=True, text=True, capture_output=True)
-            output = result.stdout.strip()
-            
-            lines = output.split('\n')
-            device_lines = [line.strip() for line in lines[1:] if line.strip()]
+            result = subprocess.run([ADB, "devices"], check=True, text=True, capture_output=True,
+                                    timeout=CONNECT_TIMEOUT)
+            # Skip the "List of devices attached" header, keep "<id> <status>" lines
+            rows = (line.split() for line in result.stdout.splitlines()[1:])
+            devices = [(parts[0], parts[1]) for parts in rows if len(parts) >= 2]
             
-            if not device_lines:
-                print("\n" + "="*60)
-                print("NO DEVICES CONNECTED")
-                print("="*60)
-                print("• No ADB devices found")
-                print("• Make sure ADB is enabled on the STB")
-                print("• Check network connectivity")
-                print("="*60 + "\n")
+            if not devices:
+                _print_banner("NO DEVICES CONNECTED", [
+                    "• No ADB devices found",
+                    "• Make sure ADB is enabled on the STB",
+                    "• Check network connectivity",
+                ], end="\n\n")
                 return []
             
-            print("\n" + "="*60)
-            print("CONNECTED ADB DEVICES")
-            print("="*60)
-            
-            devices = []
-            for i, line in enumerate(device_lines, 1):
-                parts = line.split()
-                if len(parts) >= 2:
-                    device_id = parts[0]
-                    status = parts[1]
-                    devices.append((device_id, status))
-                    
-                    if ':' in device_id:
-                        ip_part = device_id.split(':')[0]
-                        port_part = device_id.split(':')[1]
-                        print(f"{i}. IP: {ip_part} | Port: {port_part} | Status: [{status}]")
-                    else:
-                        print(f"{i}. Device: {device_id} | Status: [{status}]")
+            rows = []
+            for i, (device_id, status) in enumerate(devices, 1):
+                ip_part, sep, port_part = device_id.partition(':')
+                if sep:
+                    rows.append(f"{i}. IP: {ip_part} | Port: {port_part} | Status: [{status}]")
+                else:
+                    rows.append(f"{i}. Device: {device_id} | Status: [{status}]")
             
-            print("="*60 + "\n")
+            _print_banner("CONNECTED ADB DEVICES", rows, end="\n\n")
             return devices
             
         except subprocess.CalledProcessError as e:
-            print("\n" + "="*60)
-            print("ADB COMMAND ERROR")
-            print("="*60)
-            print("• Failed to list devices")
-            print("• Check if ADB is installed and in PATH")
-            print(f"• Error: {e.stderr if e.stderr else 'Unknown error'}")
-            print("="*60 + "\n")
+            _print_banner("ADB COMMAND ERROR", [
+                "• Failed to list devices",
+                "• Check if ADB is installed and in PATH",
+                f"• Error: {e.stderr if e.stderr else 'Unknown error'}",
+            ], end="\n\n")
             return []
         except Exception as e:
             print(f"\nError listing devices: {str(e)}\n")
@@ -172,43 +659,176 @@ class STBTester:
         """
         device = f"{ip}:{port}"
         try:
-            result = subprocess.run(["adb", "connect", device], check=True, text=True, capture_output=True)
+            result = subprocess.run([ADB, "connect", device], check=True, capture_output=True,
+                                    timeout=CONNECT_TIMEOUT)
             output = result.stdout.strip().lower()
-            if "connected" in output or "already connected" in output:
-                self.f_log(f"Successfully connected: {output}")
-                time.sleep(10)
+            if b"connected" in output or b"already connected" in output:
+                self.f_log(f"Successfully connected: {output.decode('utf-8', 'replace')}")
+                self._adb_prefix = (ADB, "-s", device)
+                self._open_shell()
+                self.f_wait_device_ready(10)
+                self._detect_input_tool()
+                self._standby.clear()
+                self._alive.set()
                 return device
             else:
+                output = output.decode("utf-8", "replace")
                 self.f_log(f"Failed to connect: {output}")
-                print("\n" + "="*60)
-                print("ADB CONNECTION FAILED")
-                print("="*60)
-                print(f"• Target: {device}")
-                print(f"• Response: {output}")
-                print("• Check if ADB is enabled on STB")
-                print("• Verify network connectivity")
-                print("="*60)
-                print("Returning to menu in 10 seconds...")
-                print("="*60)
-                time.sleep(10)
-                os.system("cls" if os.name == "nt" else "clear")
+                _print_banner("ADB CONNECTION FAILED", [
+                    f"• Target: {device}",
+                    f"• Response: {output}",
+                    "• Check if ADB is enabled on STB",
+                    "• Verify network connectivity",
+                ], "Returning to menu in 10 seconds...")
+                self._penalty_wait(10)
+                _clear()
                 return None
         except subprocess.CalledProcessError as e:
-            self.f_log(f"Connection error: {e.stderr.strip()}")
-            print("\n" + "="*60)
-            print("ADB COMMAND ERROR")
-            print("="*60)
-            print("• ADB command failed to execute")
-            print("• Check if ADB is installed and in PATH")
-            print("• Verify STB IP address is correct")
-            print(f"• Error details: {e.stderr.strip()}")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
+            error = e.stderr.decode("utf-8", "replace").strip()
+            self.f_log(f"Connection error: {error}")
+            _print_banner("ADB COMMAND ERROR", [
+                "• ADB command failed to execute",
+                "• Check if ADB is installed and in PATH",
+                "• Verify STB IP address is correct",
+                f"• Error details: {error}",
+            ], "Returning to menu in 10 seconds...")
+            self._penalty_wait(10)
+            _clear()
+            return None
+        except subprocess.TimeoutExpired:
+            self.f_log(f"Connection timeout: no answer from {device} in {CONNECT_TIMEOUT}s")
+            _print_banner("ADB CONNECTION TIMEOUT", [
+                f"• Target: {device}",
+                f"• No response in {CONNECT_TIMEOUT} seconds",
+                "• Verify network connectivity",
+                "• Make sure STB is powered on",
+            ], "Returning to menu in 10 seconds...")
+            self._penalty_wait(10)
+            _clear()
             return None
 
+    def _reuse_transport(self):
+        """
+        Reopen the shell on the existing ADB transport when the adb server still
+        lists the device, skipping a new "adb connect" handshake.
+        
+        Returns:
+            str: Device identifier if the transport is usable, None otherwise
+        """
+        if self.device is None:
+            return None
+        try:
+            result = subprocess.run((*self._adb_prefix, "get-state"), capture_output=True,
+                                    timeout=CONNECT_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0 or result.stdout.strip() != b"device":
+            return None
+        self.f_log(f"Reusing ADB transport to {self.device}")
+        self._open_shell()
+        self._standby.clear()
+        self._alive.set()
+        return self.device
+
+    def _detect_input_tool(self):
+        """Select the cheapest key injection tool the connected STB supports"""
+        try:
+            supported = self._shell_run(INPUT_PROBE, timeout=KEY_TIMEOUT).returncode == 0
+        except subprocess.SubprocessError:
+            return
+        self._input_tool = INPUT_TOOLS[0] if supported else INPUT_TOOLS[1]
+        self._key_cmds = _KEY_CMDS[self._input_tool]
+        self.f_log(f"Key injection via '{self._input_tool}'")
+
+    def _open_shell(self):
+        """Start the persistent ADB shell for the connected device"""
+        with self._shell_lock:
+            self._close_shell()
+            self._shell = subprocess.Popen((*self._adb_prefix, "shell"),
+                                           stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT, bufsize=0)
+            self._shell_lines = queue.Queue()
+            self._last_key = None
+            threading.Thread(target=self._read_shell, args=(self._shell.stdout, self._shell_lines),
+                             daemon=True).start()
+
+    @staticmethod
+    def _read_shell(stream, lines):
+        """Forward persistent shell output to a queue, None marks EOF"""
+        for line in iter(stream.readline, b""):
+            lines.put(line)
+        lines.put(None)
+
+    def _close_shell(self):
+        """Terminate the persistent ADB shell if it is running, dropping the cached readiness"""
+        with self._shell_lock:
+            self._ready_cache = (0.0, False)
+            if self._shell is None:
+                return
+            try:
+                self._shell.kill()
+                self._shell.wait(timeout=5)
+            except Exception:
+                pass
+            self._shell = None
+
+    def _shell_run(self, cmd, timeout=5, check=False, text=True):
+        """
+        Run a command through the persistent ADB shell.
+        The shell is closed on timeout or broken pipe, so the next
+        reconnection starts from a clean session. Calls are serialized.
+        
+        Args:
+            cmd (str): Shell command line
+            timeout (int): Maximum seconds to wait for the command
+            check (bool): Raise CalledProcessError on non-zero exit status
+            text (bool): Decode output to str, False keeps raw bytes
+            
+        Returns:
+            subprocess.CompletedProcess: Exit status and command output
+        """
+        with self._shell_lock:
+            if self._shell is None or self._shell.poll() is not None:
+                raise subprocess.SubprocessError("ADB shell is not running")
+            try:
+                self._shell.stdin.write(f"{cmd}\n{SHELL_SENTINEL_CMD}\n".encode("utf-8"))
+            except OSError as e:
+                self._close_shell()
+                raise subprocess.SubprocessError(f"ADB shell closed: {e}")
+
+            # Local names for the read loop below
+            sentinel = SHELL_SENTINEL.encode("ascii")
+            get_line = self._shell_lines.get
+            now = time.time
+            output = []
+            end_time = now() + timeout
+            while True:
+                try:
+                    line = get_line(timeout=max(0, end_time - now()))
+                except queue.Empty:
+                    self._close_shell()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                if line is None:
+                    self._close_shell()
+                    raise subprocess.SubprocessError("ADB shell closed unexpectedly")
+                index = line.find(sentinel)
+                if index < 0:
+                    output.append(line)
+                    continue
+                output.append(line[:index])
+                try:
+                    returncode = int(line[index + len(sentinel):].strip() or 1)
+                except ValueError:
+                    # Output out of step with the commands: start from a clean session
+                    self._close_shell()
+                    raise subprocess.SubprocessError(f"Unexpected ADB shell output: {line!r}")
+                stdout = b"".join(output)
+                if text:
+                    stdout = stdout.decode("utf-8", "replace")
+                if check and returncode != 0:
+                    raise subprocess.CalledProcessError(returncode, cmd, stdout)
+                return subprocess.CompletedProcess(cmd, returncode, stdout)
+
     def f_disable_cec(self, device):
         """
         Disable CEC (Consumer Electronics Control) on STB to prevent interference during tests.
@@ -222,126 +842,45 @@ class STBTester:
         """
         try:
             self.f_log("Disabling CEC (Consumer Electronics Control) - Android 14 compatible...")
+
+            # All methods run in a single shell call, each one reports its own result
+            script = " ; ".join(f"({cmd}) && echo OK:{i} || echo FAIL:{i}"
+                                for i, (cmd, _, _) in enumerate(CEC_METHODS))
+            result = self._shell_run(script, timeout=30)
+            reported = {line.strip() for line in result.stdout.splitlines()}
+
             success_count = 0
-        
-            # Method 1: Traditional global settings (Android 13 and below)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "global", 
-                    "hdmi_control_enabled", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 1: Global HDMI control disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 1: Global HDMI control - FAILED")
-        
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "global", 
-                    "hdmi_volume_use_cec", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 1: Global HDMI volume CEC disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 1: Global HDMI volume CEC - FAILED")
-        
-            # Method 2: Secure settings (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "secure", 
-                    "hdmi_control_enabled", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 2: Secure HDMI control disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 2: Secure HDMI control - FAILED")
-        
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "secure", 
-                    "hdmi_volume_use_cec", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 2: Secure HDMI volume CEC disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 2: Secure HDMI volume CEC - FAILED")
-        
-            # Method 3: System settings (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "system", 
-                    "hdmi_control_enabled", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 3: System HDMI control disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 3: System HDMI control - FAILED")
-        
-            # Method 4: Direct property setting (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "setprop", "ro.hdmi.device_type", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 4: HDMI device type property disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 4: HDMI device type property - FAILED")
-        
-            # Method 5: CEC service control (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "cmd", "hdmi_control", "cec_setting", "--enabled", "false"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 5: CEC service control disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 5: CEC service control - FAILED")
-        
-            # Method 6: Alternative CEC disable (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "global", 
-                    "hdmi_cec_enabled", "0"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 6: Alternative CEC setting disabled")
-                success_count += 1
-            except:
-                self.f_log("• Method 6: Alternative CEC setting - FAILED")
-        
-            # Method 7: TV input service (Android 14)
-            try:
-                subprocess.run([
-                    "adb", "-s", device, "shell", "settings", "put", "secure", 
-                    "tv_input_hidden_inputs", "1"
-                ], check=True, text=True, capture_output=True, timeout=10)
-                self.f_log("• Method 7: TV input service configured")
-                success_count += 1
-            except:
-                self.f_log("• Method 7: TV input service - FAILED")
+            for i, (_, success_msg, failure_msg) in enumerate(CEC_METHODS):
+                if f"OK:{i}" in reported:
+                    self.f_log(f"• {success_msg}")
+                    success_count += 1
+                else:
+                    self.f_log(f"• {failure_msg}")
         
             # Summary
             if success_count > 0:
-                self.f_log(f"CEC disable completed: {success_count}/7 methods successful")
+                self.f_log(f"CEC disable completed: {success_count}/{len(CEC_METHODS)} methods successful")
                 self.f_log("• STB should now have reduced CEC interference")
-                time.sleep(5)
+                self._pause(5)
                 return True
             else:
                 self.f_log("CEC disable failed: All methods unsuccessful")
                 self.f_log("• Warning: CEC interference may occur during tests")
                 self.f_log("• Tests will continue normally")
-                time.sleep(5)
+                self._pause(5)
                 return False
             
         except Exception as e:
             self.f_log(f"Critical error during CEC disable: {str(e)}")
             self.f_log("• Warning: CEC interference may occur during tests")
             self.f_log("• Tests will continue normally")
-            time.sleep(5)
+            self._pause(5)
             return False
 
     def f_is_device_ready(self, device):
         """
         Check if device is ready to receive commands.
+        Results are cached for READY_CACHE_TTL seconds.
         
         Args:
             device (str): Device identifier
@@ -349,11 +888,122 @@ class STBTester:
         Returns:
             bool: True if device is ready, False otherwise
         """
+        checked_at, ready = self._ready_cache
+        if time.time() - checked_at < READY_CACHE_TTL:
+            return ready
         try:
-            result = subprocess.run(["adb", "-s", device, "get-state"], check=True, text=True, capture_output=True)
-            return result.stdout.strip() == "device"
+            ready = self._shell_run("true").returncode == 0
         except:
+            ready = False
+        self._ready_cache = (time.time(), ready)
+        return ready
+
+    def f_wait_device_ready(self, timeout):
+        """
+        Poll the connected device until it accepts shell commands.
+        Reopens the persistent shell while the device is still coming up.
+        
+        Args:
+            timeout (int): Maximum seconds to wait
+            
+        Returns:
+            bool: True if device became ready, False on timeout
+        """
+        end_time = time.time() + timeout
+        while True:
+            if self._shell is None or self._shell.poll() is not None:
+                self._open_shell()
+            try:
+                if self._shell_run("true", timeout=max(1, end_time - time.time())).returncode == 0:
+                    self._ready_cache = (time.time(), True)
+                    return True
+            except subprocess.SubprocessError:
+                pass
+            if time.time() >= end_time:
+                return False
+            time.sleep(POLL_INTERVAL)
+
+    def f_wait_until_ready(self, device, probe, expected, timeout=5.0, interval=0.1):
+        """
+        Poll a shell probe until its output contains the expected text.
+        
+        Args:
+            device (str): Device identifier
+            probe (str): Shell command run on the device
+            expected (str): Text that signals the device is ready
+            timeout (float): Maximum seconds to wait
+            interval (float): Seconds between probes
+            
+        Returns:
+            bool: True if the expected text appeared, False on timeout
+        """
+        end_time = time.time() + timeout
+        while True:
+            try:
+                if expected in self._shell_run(probe, timeout=5).stdout:
+                    return True
+            except subprocess.SubprocessError:
+                return False
+            if time.time() >= end_time:
+                return False
+            time.sleep(interval)
+
+    def f_wait_for_activity(self, device, package, timeout):
+        """
+        Wait until an application window has focus on the device.
+        
+        Args:
+            device (str): Device identifier
+            package (str): Application package name
+            timeout (int): Maximum seconds to wait
+            
+        Returns:
+            bool: True if the application is in foreground, False on timeout
+        """
+        return self.f_wait_until_ready(device, FOCUS_PROBE, f"{package}/", timeout, POLL_INTERVAL)
+
+    def _current_focus(self, device):
+        """
+        Read the focused window and app from the device.
+        
+        Args:
+            device (str): Device identifier
+            
+        Returns:
+            str: FOCUS_PROBE output, None if the probe failed
+        """
+        try:
+            return self._shell_run(FOCUS_PROBE, timeout=5).stdout
+        except subprocess.SubprocessError:
+            return None
+
+    def f_wait_focus_change(self, device, before, timeout=FOCUS_CHANGE_TIMEOUT):
+        """
+        Wait until the focused window differs from a snapshot taken before a key.
+        Gives up after timeout, so a key that doesn't move the focus costs
+        the same as the fixed pause this replaces.
+        
+        Args:
+            device (str): Device identifier
+            before (str): _current_focus() output taken before the key
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            bool: True if the focus changed, False on timeout or probe failure
+        """
+        if before is None:
+            time.sleep(timeout)
             return False
+        end_time = time.time() + timeout
+        while True:
+            focus = self._current_focus(device)
+            if focus is None:
+                return False
+            if focus != before:
+                return True
+            if time.time() >= end_time:
+                return False
+            time.sleep(POLL_INTERVAL)
 
     def f_is_in_standby(self, device):
         """
@@ -366,30 +1016,70 @@ class STBTester:
             bool: True if in standby, False otherwise
         """
         try:
-            result = subprocess.run(["adb", "-s", device, "shell", "dumpsys", "power"], 
-                                  text=True, capture_output=True, timeout=5)
-            output = result.stdout.lower()
-            return ("mwakefulness=asleep" in output or 
-                   "mwakefulness=dozing" in output or 
-                   "display power: state=off" in output)
+            result = self._shell_run("dumpsys power", timeout=5, text=False)
+            return bool(self._STANDBY_RE.search(result.stdout))
         except:
             return False
 
-    def f_wait_standby_exit(self, device, initial_time, duration):
+    def _run_watchdog(self, stop):
+        """
+        Probe the device in the background and publish its state, until
+        stop is set (see _end_session).
+        Clears self._alive when "adb get-state" stops reporting the device,
+        and every STANDBY_CHECK_INTERVAL seconds mirrors the power state in
+        self._standby, so test loops only read two flags. Probes run in their
+        own adb processes, never through the shell used for keys.
+        
+        Args:
+            stop (threading.Event): Set to end the watchdog
+        """
+        prefix = self._adb_prefix
+        next_power_check = 0.0
+        while not stop.wait(WATCHDOG_INTERVAL):
+            try:
+                result = subprocess.run((*prefix, "get-state"), capture_output=True,
+                                        timeout=WATCHDOG_TIMEOUT)
+                online = result.returncode == 0 and result.stdout.strip() == b"device"
+            except (OSError, subprocess.TimeoutExpired):
+                online = False
+            if not online:
+                if not stop.is_set():
+                    self._alive.clear()
+                continue
+            if time.monotonic() < next_power_check:
+                continue
+            next_power_check = time.monotonic() + STANDBY_CHECK_INTERVAL
+            try:
+                result = subprocess.run((*prefix, "shell", "dumpsys power"), capture_output=True,
+                                        timeout=WATCHDOG_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                # Slow power service: keep the last known state, keys are unaffected
+                continue
+            if self._STANDBY_RE.search(result.stdout):
+                self._standby.set()
+            else:
+                self._standby.clear()
+
+    def f_wait_standby_exit(self, device, deadline):
         """
         Wait for STB to exit standby mode.
+        Polls with exponential backoff and never sleeps past the test end.
         
         Args:
             device (str): Device identifier
-            initial_time (float): Test initial time
-            duration (int): Maximum test duration
+            deadline (float): time.monotonic() value at which the test ends
         """
         self.f_log("STB is in STANDBY. Waiting for wake-up...")
+        backoff = STANDBY_POLL_MIN
         while self.f_is_in_standby(device):
-            if time.time() - initial_time >= duration:
-                self.f_log(f"Maximum time of {duration} reached during standby.")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.f_log("Maximum test time reached during standby.")
                 sys.exit(0)
-            time.sleep(10)
+            time.sleep(min(backoff, remaining))
+            backoff = min(STANDBY_POLL_MAX, backoff * 2)
+        self._standby.clear()
+        self._last_key = None
         self.f_log("STB returned from standby.")
 
     # ========================================================================
@@ -405,72 +1095,144 @@ class STBTester:
             key_code (str): Android key code
             key_name (str): Descriptive key name for logs
             
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        return self._send_script(f"{self._input_tool} keyevent {key_code}", key_name, timeout=KEY_TIMEOUT)
+
+    def _send_script(self, script, label, timeout):
+        """
+        Run a key sending script through the persistent shell and log the result.
+        
+        Args:
+            script (str): Shell script with one or more input keyevent commands
+            label (str): Key name(s) for logs
+            timeout (int): Maximum seconds to wait for the script
+            
         Returns:
             bool: True if sent successfully, False otherwise
         """
         try:
-            subprocess.run(["adb", "-s", device, "shell", "input", "keyevent", key_code], 
-                          check=True, text=True, capture_output=True, timeout=5)
+            self._shell_run(script, timeout=timeout, check=True)
+            self._last_key = label
             self.error_already_shown = False
-            self.f_log(f"{key_name} sent successfully")
+            self.f_log(f"{label} sent successfully")
             return True
         except Exception as e:
+            self._ready_cache = (0.0, False)
+            self._last_key = None
             if not self.error_already_shown:
-                self.f_log(f"Error sending {key_name}: {str(e)}")
+                self.f_log(f"Error sending {label}: {str(e)}")
                 self.error_already_shown = True
-            time.sleep(5)
+            self._pause(5)
+            return False
+
+    def f_send(self, name, device):
+        """
+        Send a key from KEY_TABLE, applying its delay before or after the key.
+        
+        Args:
+            name (str): Key name in KEY_TABLE (ex: "HOME")
+            device (str): Device identifier
+            
+        Returns:
+            bool: True if sent successfully, False otherwise
+        """
+        _, delay, when = KEY_TABLE[name]
+        if when == "pre":
+            time.sleep(delay)
+            return self._send_script(self._key_cmds[name], f"KEY_{name}", KEY_TIMEOUT)
+        if self._send_script(self._key_cmds[name], f"KEY_{name}", KEY_TIMEOUT):
+            time.sleep(delay)
+            return True
+        return False
+
+    def f_send_sequence(self, names, device):
+        """
+        Send several keys from KEY_TABLE in a single shell call.
+        Key delays run on the device, so the timing matches f_send.
+        Runs of the same key are sent as one shell loop.
+        
+        Args:
+            names (tuple): Key names in KEY_TABLE, in sending order
+            device (str): Device identifier
+            
+        Returns:
+            bool: True if all keys were sent, False otherwise
+        """
+        script, label, timeout = _build_key_script(tuple(names), self._input_tool)
+        return self._send_script(script, label, timeout)
+
+    def _send_flow_with_navigation(self, device):
+        """HOME, wait for the focus to move, then open the FLOW app (navigation sequences)"""
+        before = self._current_focus(device)
+        if not self.f_send_home_key(device):
             return False
+        self.f_wait_focus_change(device, before)
+        return self.f_send_flow_key(device)
+
+    def _batch_steps(self, sequence):
+        """
+        Group consecutive key codes of a sequence into batched send steps.
+        
+        Args:
+            sequence (tuple): Integer key codes and/or names of methods taking a device
+            
+        Returns:
+            list: Functions taking a device, for use with f_check_and_send
+        """
+        send = self.f_send_sequence
+        steps = []
+        pending = []
+        for item in sequence:
+            if not isinstance(item, int):
+                if pending:
+                    steps.append(functools.partial(send, tuple(pending)))
+                    pending = []
+                steps.append(getattr(self, item))
+                continue
+            pending.append(KEY_BY_CODE[item])
+            if len(pending) == NAV_BATCH_SIZE:
+                steps.append(functools.partial(send, tuple(pending)))
+                pending = []
+        if pending:
+            steps.append(functools.partial(send, tuple(pending)))
+        return steps
 
     # ========================================================================
     # SPECIFIC KEYS - NAVIGATION
     # ========================================================================
 
     def f_send_home_key(self, device):
-        """Send HOME key (code 3)"""
-        if self.f_send_key(device, "3", "KEY_HOME"):
-            time.sleep(10)
+        """Send HOME key (code 3), skipped when HOME was the last key sent"""
+        if self._last_key == "KEY_HOME":
+            self.f_log("KEY_HOME skipped, already on HOME")
             return True
-        return False
+        return self.f_send("HOME", device)
 
     def f_send_right_key(self, device):
         """Send RIGHT key (code 22)"""
-        if self.f_send_key(device, "22", "KEY_RIGHT"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("RIGHT", device)
 
     def f_send_left_key(self, device):
         """Send LEFT key (code 21)"""
-        if self.f_send_key(device, "21", "KEY_LEFT"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("LEFT", device)
 
     def f_send_down_key(self, device):
         """Send DOWN key (code 20)"""
-        if self.f_send_key(device, "20", "KEY_DOWN"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("DOWN", device)
 
     def f_send_up_key(self, device):
         """Send UP key (code 19)"""
-        if self.f_send_key(device, "19", "KEY_UP"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("UP", device)
 
     def f_send_ok_key(self, device):
         """Send OK/SELECT key (code 23)"""
-        if self.f_send_key(device, "23", "KEY_OK"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("OK", device)
 
     def f_send_back_key(self, device):
         """Send BACK key (code 4)"""
-        time.sleep(10)
-        return self.f_send_key(device, "4", "KEY_BACK")
+        return self.f_send("BACK", device)
 
     # ========================================================================
     # SPECIFIC KEYS - TV AND CHANNELS
@@ -478,25 +1240,19 @@ class STBTester:
 
     def f_send_live_key(self, device):
         """Send LIVE key (code 170)"""
-        if self.f_send_key(device, "170", "KEY_LIVE"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("LIVE", device)
 
     def f_send_guide_key(self, device):
         """Send GUIDE key (code 172)"""
-        time.sleep(5)
-        return self.f_send_key(device, "172", "KEY_GUIDE")
+        return self.f_send("GUIDE", device)
 
     def f_send_channelUP_key(self, device):
         """Send CHANNEL UP key (code 166) - with longer delay for zapping"""
-        time.sleep(20)
-        return self.f_send_key(device, "166", "KEY_CHANNEL_UP")
+        return self.f_send("CHANNEL_UP", device)
 
     def f_send_channelDOWN_key(self, device):
         """Send CHANNEL DOWN key (code 167) - with longer delay for zapping"""
-        time.sleep(20)
-        return self.f_send_key(device, "167", "KEY_CHANNEL_DOWN")
+        return self.f_send("CHANNEL_DOWN", device)
 
     # ========================================================================
     # SPECIFIC KEYS - VOLUME AND AUDIO
@@ -504,24 +1260,15 @@ class STBTester:
 
     def f_send_volume_up_key(self, device):
         """Send VOLUME UP key (code 24)"""
-        if self.f_send_key(device, "24", "KEY_VOLUME_UP"):
-            time.sleep(3)
-            return True
-        return False
+        return self.f_send("VOLUME_UP", device)
 
     def f_send_volume_down_key(self, device):
         """Send VOLUME DOWN key (code 25)"""
-        if self.f_send_key(device, "25", "KEY_VOLUME_DOWN"):
-            time.sleep(3)
-            return True
-        return False
+        return self.f_send("VOLUME_DOWN", device)
 
     def f_send_mute_key(self, device):
         """Send MUTE key (code 164)"""
-        if self.f_send_key(device, "164", "KEY_MUTE"):
-            time.sleep(5)
-            return True
-        return False
+        return self.f_send("MUTE", device)
 
     # ========================================================================
     # SPECIFIC KEYS - POWER
@@ -529,17 +1276,11 @@ class STBTester:
 
     def f_send_standby_key(self, device):
         """Send standby command (code 26) - with 10s delay"""
-        if self.f_send_key(device, "26", "KEY_STANDBY"):
-            time.sleep(10)
-            return True
-        return False
+        return self.f_send("STANDBY", device)
 
     def f_send_wake_up_key(self, device):
         """Send wake-up command (code 224) - with 20s delay"""
-        if self.f_send_key(device, "224", "KEY_WAKEUP"):
-            time.sleep(20)
-            return True
-        return False
+        return self.f_send("WAKEUP", device)
 
     # ========================================================================
     # APPLICATION OPENING
@@ -549,15 +1290,14 @@ class STBTester:
         """
         Open default application via activity manager.
         """
+        self._last_key = None
         try:
-            subprocess.run([
-                "adb", "-s", device, "shell", "am", "start", "-n",
-                "ar.com.flow.androidtv_stb/ar.com.flow.androidtv.base.view.BaseActivity",
-                "-a", "android.intent.action.MAIN",
-                "-c", "android.intent.category.LEANBACK_LAUNCHER"
-            ], check=True, text=True, capture_output=True, timeout=5)
+            self._shell_run(
+                "am start -n ar.com.flow.androidtv_stb/ar.com.flow.androidtv.base.view.BaseActivity"
+                " -a android.intent.action.MAIN -c android.intent.category.LEANBACK_LAUNCHER",
+                timeout=5, check=True)
             self.f_log("KEY_APP sent successfully")
-            time.sleep(15)
+            self.f_wait_for_activity(device, "ar.com.flow.androidtv_stb", 15)
             return True
         except subprocess.SubprocessError as e:
             self.f_log(f"Error opening APP: {str(e)}")
@@ -575,14 +1315,12 @@ class STBTester:
         Returns:
             bool: True if opened successfully, False otherwise
         """
+        self._last_key = None
         try:
-            subprocess.run(
-                ["adb", "-s", device, "shell", "monkey", "-p", package, 
-                 "-c", "android.intent.category.LAUNCHER", "1"],
-                check=True, text=True, capture_output=True, timeout=5
-            )
+            self._shell_run(f"monkey -p {package} -c android.intent.category.LAUNCHER 1",
+                            timeout=5, check=True)
             self.f_log(f"{description.strip()} opened successfully")
-            time.sleep(30)
+            self.f_wait_for_activity(device, package, 30)
             return True
         except subprocess.SubprocessError as e:
             self.f_log(f"Error opening {description.strip()}: {str(e)}")
@@ -601,14 +1339,12 @@ class STBTester:
         Returns:
             bool: True if opened successfully, False otherwise
         """
+        self._last_key = None
         try:
-            subprocess.run(
-                ["adb", "-s", device, "shell", "monkey", "-p", package, 
-                 "-c", "android.intent.category.LEANBACK_LAUNCHER", "1"],
-                check=True, text=True, capture_output=True, timeout=5
-            )
+            self._shell_run(f"monkey -p {package} -c android.intent.category.LEANBACK_LAUNCHER 1",
+                            timeout=5, check=True)
             self.f_log(f"{description} opened successfully")
-            time.sleep(30)
+            self.f_wait_for_activity(device, package, 30)
             return True
         except subprocess.SubprocessError as e:
             self.f_log(f"Error opening {description}: {str(e)}")
@@ -618,67 +1354,76 @@ class STBTester:
     # RECONNECTION SYSTEM
     # ========================================================================
 
-    def f_reconnect_and_reinitialize(self, ip, port, initial_time, duration):
+    def f_reconnect_and_reinitialize(self, deadline):
         """
         Standard reconnection system - tries to reconnect and reinitialize.
+        Reconnects to self.ip/self.port and updates self.device.
         
         Args:
-            ip (str): STB IP
-            port (int): ADB port
-            initial_time (float): Test initial time
-            duration (int): Maximum test duration
+            deadline (float): time.monotonic() value at which the test ends
             
         Returns:
-            tuple: (device identifier, boolean indicating if reconnected)
+            bool: True once the device is reconnected and reinitialized
         """
         self.f_log("Attempting device reconnection...")
+        self.f_flush_log()
+        self._close_shell()
+        # First attempt reuses the live ADB transport, retries run "adb connect"
+        reuse = True
         while True:
-            if time.time() - initial_time >= duration:
-                self.f_log(f"Maximum execution time reached = {duration} during reconnection.")
+            if time.monotonic() >= deadline:
+                self.f_log("Maximum execution time reached during reconnection.")
                 sys.exit(0)
             
-            new_device = self.f_connect_device(ip, port)
+            new_device = (reuse and self._reuse_transport()) or self.f_connect_device(self.ip, self.port)
+            reuse = False
             if new_device and self.f_is_device_ready(new_device):
                 self.f_log("Reconnection successful! Restarting command sequence...")
                 time.sleep(30)
                 if self.f_send_home_key(new_device):
+                    self.device = new_device
                     self.error_already_shown = False
-                    return new_device, True
+                    return True
                 else:
                     self.f_log("Failed to resend commands after reconnection.")
             else:
                 self.f_log("Reconnection not yet possible. Trying again in 5s...")
                 time.sleep(5)
 
-    def f_reconnect_and_reinitialize_project1(self, ip, port, initial_time, duration):
+    def f_reconnect_and_reinitialize_project1(self, deadline):
         """
         Project 1 specific reconnection system.
         Reinitialize with GUIDE -> BACK sequence.
+        Reconnects to self.ip/self.port and updates self.device.
         
         Args:
-            ip (str): STB IP
-            port (int): ADB port
-            initial_time (float): Test initial time
-            duration (int): Maximum test duration
+            deadline (float): time.monotonic() value at which the test ends
             
         Returns:
-            tuple: (device identifier, boolean indicating if reconnected)
+            bool: True once the device is reconnected and reinitialized
         """
         self.f_log("Attempting device reconnection (Project 1)...")
+        self.f_flush_log()
+        self._close_shell()
+        # First attempt reuses the live ADB transport, retries run "adb connect"
+        reuse = True
         while True:
-            if time.time() - initial_time >= duration:
+            if time.monotonic() >= deadline:
                 self.f_log("Maximum execution time reached during reconnection.")
                 sys.exit(0)
             
-            new_device = self.f_connect_device(ip, port)
+            new_device = (reuse and self._reuse_transport()) or self.f_connect_device(self.ip, self.port)
+            reuse = False
             if new_device and self.f_is_device_ready(new_device):
                 self.f_log("Reconnection successful! Restarting Project 1 sequence...")
                 time.sleep(30)
+                # Only HOME has to go through, GUIDE and BACK are best-effort
                 if self.f_send_home_key(new_device):
                     self.f_send_guide_key(new_device)
                     self.f_send_back_key(new_device)
+                    self.device = new_device
                     self.error_already_shown = False
-                    return new_device, True
+                    return True
                 else:
                     self.f_log("Failed to resend commands after reconnection.")
             else:
@@ -689,49 +1434,47 @@ class STBTester:
     # AUXILIARY FUNCTIONS
     # ========================================================================
 
-    def f_check_and_send(self, func, device, ip, port, initial_time, duration):
+    def f_check_and_send(self, func, deadline):
         """
         Check standby and send command with failure handling.
         
         Args:
-            func: Command function to execute
-            device (str): Device identifier
-            ip (str): STB IP
-            port (int): ADB port
-            initial_time (float): Test initial time
-            duration (int): Maximum test duration
+            func: Command function to execute, called with self.device
+            deadline (float): time.monotonic() value at which the test ends
             
         Returns:
-            tuple: (device identifier, boolean indicating if reconnected)
+            bool: True if the device had to be reconnected
         """
-        if self.f_is_in_standby(device):
-            self.f_wait_standby_exit(device, initial_time, duration)
-        
-        if not func(device):
-            return self.f_reconnect_and_reinitialize(ip, port, initial_time, duration)
-        return device, False
+        if not self._alive.is_set():
+            self.f_log("Watchdog reported lost connection.")
+            return self.f_reconnect_and_reinitialize(deadline)
+        if self._standby.is_set():
+            self.f_wait_standby_exit(self.device, deadline)
+        
+        if not func(self.device):
+            return self.f_reconnect_and_reinitialize(deadline)
+        return False
 
-    def f_check_and_send_project1(self, func, device, ip, port, initial_time, duration):
+    def f_check_and_send_project1(self, func, deadline):
         """
         Check standby and send command with failure handling for Project 1 zapping.
         
         Args:
-            func: Command function to execute
-            device (str): Device identifier
-            ip (str): STB IP
-            port (int): ADB port
-            initial_time (float): Test initial time
-            duration (int): Maximum test duration
+            func: Command function to execute, called with self.device
+            deadline (float): time.monotonic() value at which the test ends
             
         Returns:
-            tuple: (device identifier, boolean indicating if reconnected)
+            bool: True if the device had to be reconnected
         """
-        if self.f_is_in_standby(device):
-            self.f_wait_standby_exit(device, initial_time, duration)
-        
-        if not func(device):
-            return self.f_reconnect_and_reinitialize_project1(ip, port, initial_time, duration)
-        return device, False
+        if not self._alive.is_set():
+            self.f_log("Watchdog reported lost connection.")
+            return self.f_reconnect_and_reinitialize_project1(deadline)
+        if self._standby.is_set():
+            self.f_wait_standby_exit(self.device, deadline)
+        
+        if not func(self.device):
+            return self.f_reconnect_and_reinitialize_project1(deadline)
+        return False
 
     def f_get_connection_info(self):
         """
@@ -750,13 +1493,11 @@ class STBTester:
             
             self.port = 5555
             
-            print("\n" + "="*60)
-            print("SELECT THE DURATION OF THE TEST!")
-            print("="*60)
-            print("1 - 12 Hours")
-            print("2 - 24 Hours")
-            print("3 - Custom Duration")
-            print("="*60)
+            _print_banner("SELECT THE DURATION OF THE TEST!", [
+                "1 - 12 Hours",
+                "2 - 24 Hours",
+                "3 - Custom Duration",
+            ])
 
             duration_input = input("\nEnter the desired duration: ").strip()
 
@@ -792,16 +1533,12 @@ class STBTester:
                 raise ValueError("Invalid Option!")
             
         except ValueError as e:
-            print("\n" + "="*60)
-            print("INPUT ERROR")
-            print("="*60)
-            print(f"• {str(e)}")
-            print("• Please enter valid values")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
+            _print_banner("INPUT ERROR", [
+                f"• {str(e)}",
+                "• Please enter valid values",
+            ], "Returning to menu in 10 seconds...")
+            self._penalty_wait(10)
+            _clear()
             return None
 
     def f_initialize_device(self):
@@ -813,144 +1550,164 @@ class STBTester:
         """
         self.device = self.f_connect_device(self.ip, self.port)
         if not self.device or not self.f_is_device_ready(self.device):
-            print("\n" + "="*60)
-            print("CONNECTION ERROR")
-            print("="*60)
-            print("• Device is not ready")
-            print("• Check ADB permission on STB")
-            print("• Verify IP address and network connection")
-            print("• Make sure STB is powered on")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
+            _print_banner("CONNECTION ERROR", [
+                "• Device is not ready",
+                "• Check ADB permission on STB",
+                "• Verify IP address and network connection",
+                "• Make sure STB is powered on",
+            ], "Returning to menu in 10 seconds...")
+            self._penalty_wait(10)
+            _clear()
             return False
         
+        self.error_already_shown = False
+        if self._watchdog is None:
+            # Fresh stop flag per thread, so a late-exiting old watchdog stays stopped
+            self._watchdog_stop = threading.Event()
+            self._watchdog = threading.Thread(target=self._run_watchdog,
+                                              args=(self._watchdog_stop,), daemon=True)
+            self._watchdog.start()
         self.f_disable_cec(self.device)
         return True
 
-    # ========================================================================
-    # PROJECT MENUS
-    # ========================================================================
+    def _end_session(self):
+        """Stop the watchdog and close the shell once a test is over"""
+        self._watchdog_stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(2 * WATCHDOG_TIMEOUT + WATCHDOG_INTERVAL)
+            self._watchdog = None
+        self._close_shell()
 
-    def f_menu_project1(self):
-        """Project 1 specific menu"""
-        while True:
-            print("\n" + "="*50)
-            print("PROJECT 1 - AVAILABLE TESTS")
-            print("="*50)
-            print("1 - Zapping")
-            print("2 - Navigation")
-            print("3 - Apps")
-            print("4 - StandbyWakeup")
-            print("5 - Volume Control")
-            print("0 - Back to main menu")
-            print("="*50)
+    def _start_deadline(self, duration):
+        """
+        Arm the test deadline. Loops check the _expired flag, set by SIGALRM
+        where available (POSIX, main thread) or by a timer thread otherwise.
+        
+        Args:
+            duration (int): Test duration in seconds
             
-            try:
-                option = input("Choose an option: ").strip()
+        Returns:
+            float: time.monotonic() value at which the test ends, for reconnection
+        """
+        self._expired = False
+        if hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGALRM, self._on_deadline)
+            signal.setitimer(signal.ITIMER_REAL, max(duration, 0.001))
+        else:
+            self._deadline_timer = threading.Timer(duration, self._on_deadline)
+            self._deadline_timer.daemon = True
+            self._deadline_timer.start()
+        return time.monotonic() + duration
+
+    def _on_deadline(self, *args):
+        """SIGALRM handler / timer callback - marks the test deadline as reached"""
+        self._expired = True
+
+    def _stop_deadline(self):
+        """Disarm the test deadline once the loop is over"""
+        if self._deadline_timer is not None:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
+        elif hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def _initial_home(self):
+        """Default initial sequence: HOME"""
+        self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
+        self.f_send_home_key(self.device)
+        self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
+
+    def _run_test(self, name, log_tag, step_fn, initial_fn=None, log_restart=True):
+        """
+        Test body shared by the single-cycle tests:
+        logging setup -> connection info -> device init -> repeat step until the deadline.
+        
+        Args:
+            name (str): Test name used in log lines (ex: "Apps")
+            log_tag (str): Test name passed to f_setup_logging
+            step_fn: One test loop, called with the deadline, returns True on reconnection
+            initial_fn: Run at start and after each reconnection (default: _initial_home)
+            log_restart (bool): Log "RECONNECTION DETECTED" when a step reconnected
+        """
+        self.f_log(f"=== STARTING {name.upper()} TEST ===")
+        
+        if not self.f_setup_logging(log_tag):
+            return
+        duration = self.f_get_connection_info()
+        
+        if duration is None:
+            return
+        
+        if not self.f_initialize_device():
+            return
+        
+        initial_fn = initial_fn or self._initial_home
+        deadline = self._start_deadline(duration)
+        loop = 0
+        need_initial_sequence = True
+        
+        try:
+            while not self._expired:
                 
-                if option == "1":
-                    self.f_test_zapping_project1()
-                elif option == "2":
-                    self.f_test_navigation_project1()
-                elif option == "3":
-                    self.f_test_apps()
-                elif option == "4":
-                    self.f_test_standby_wakeup()
-                elif option == "5":
-                    self.f_test_volume_control()
-                elif option == "0":
-                    break
-                else:
-                    print(" Invalid option! Choose a valid option.")
-                    time.sleep(1)
-                    os.system("cls" if os.name == "nt" else "clear")
-                    
-            except KeyboardInterrupt:
-                print("\n Returning to main menu...")
-                break
-            except Exception as e:
-                print(f" Error: {e}")
-                time.sleep(1)
-                os.system("cls" if os.name == "nt" else "clear")
-
-    def f_menu_project2(self):
-        """Project 2 specific menu"""
-        while True:
-            print("\n" + "="*50)
-            print("PROJECT 2 - AVAILABLE TESTS")
-            print("="*50)
-            print("1 - Zapping")
-            print("2 - Navigation")
-            print("3 - Apps")
-            print("4 - StandbyWakeup")
-            print("5 - Volume Control")
-            print("0 - Back to main menu")
-            print("="*50)
-            
-            try:
-                option = input("Choose an option: ").strip()
+                if need_initial_sequence:
+                    initial_fn()
+                    need_initial_sequence = False
                 
-                if option == "1":
-                    self.f_test_zapping_standard()
-                elif option == "2":
-                    self.f_test_navigation_project2()
-                elif option == "3":
-                    self.f_test_apps()
-                elif option == "4":
-                    self.f_test_standby_wakeup()
-                elif option == "5":
-                    self.f_test_volume_control()
-                elif option == "0":
-                    break
-                else:
-                    print(" Invalid option! Choose a valid option.")
-                    time.sleep(1)
-                    os.system("cls" if os.name == "nt" else "clear")
-                    
-            except KeyboardInterrupt:
-                print("\n Returning to main menu...")
-                break
-            except Exception as e:
-                print(f" Error: {e}")
-                time.sleep(1)
-                os.system("cls" if os.name == "nt" else "clear")
+                if step_fn(deadline):
+                    if log_restart:
+                        self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
+                    loop = 0
+                    need_initial_sequence = True
+                    continue
+                
+                loop += 1
+                self.f_log("LOOP %d CONCLUDED", loop)
+            
+        except Exception as e:
+            self.f_log(f"Execution terminated due to fatal error: {e}")
+        finally:
+            self._stop_deadline()
+            self._end_session()
+        
+        self.f_log(f"{name} Test of {duration} seconds completed.")
+        
+        self.f_flush_log()
 
-    def f_menu_project3(self):
-        """Project 3 specific menu"""
+    # ========================================================================
+    # PROJECT MENUS
+    # ========================================================================
+
+    # Test method names per project menu option
+    _PROJECT_DISPATCH = {
+        1: {"1": "f_test_zapping_project1", "2": "f_test_navigation_project1"},
+        2: {"1": "f_test_zapping_standard", "2": "f_test_navigation_project2"},
+        3: {"1": "f_test_zapping_standard", "2": "f_test_navigation_project3"},
+    }
+    _COMMON_TESTS = {"3": "f_test_apps", "4": "f_test_standby_wakeup", "5": "f_test_volume_control"}
+
+    def f_menu_project(self, project_id):
+        """
+        Project specific menu.
+        
+        Args:
+            project_id (int): Project number, key of _PROJECT_DISPATCH
+        """
+        tests = self._PROJECT_DISPATCH[project_id]
         while True:
-            print("\n" + "="*50)
-            print("PROJECT 3 - AVAILABLE TESTS")
-            print("="*50)
-            print("1 - Zapping")
-            print("2 - Navigation")
-            print("3 - Apps")
-            print("4 - StandbyWakeup")
-            print("5 - Volume Control")
-            print("0 - Back to main menu")
-            print("="*50)
+            _write_raw(_PROJECT_MENUS[project_id])
             
             try:
-                option = input("Choose an option: ").strip()
+                option = _prompt("Choose an option: ")
+                handler = tests.get(option) or self._COMMON_TESTS.get(option)
                 
-                if option == "1":
-                    self.f_test_zapping_standard()
-                elif option == "2":
-                    self.f_test_navigation_project3()
-                elif option == "3":
-                    self.f_test_apps()
-                elif option == "4":
-                    self.f_test_standby_wakeup()
-                elif option == "5":
-                    self.f_test_volume_control()
+                if handler:
+                    getattr(self, handler)()
                 elif option == "0":
                     break
                 else:
                     print(" Invalid option! Choose a valid option.")
                     time.sleep(1)
-                    os.system("cls" if os.name == "nt" else "clear")
+                    _clear()
                     
             except KeyboardInterrupt:
                 print("\n Returning to main menu...")
@@ -958,106 +1715,46 @@ class STBTester:
             except Exception as e:
                 print(f" Error: {e}")
                 time.sleep(1)
-                os.system("cls" if os.name == "nt" else "clear")
+                _clear()
 
     # ========================================================================
     # ZAPPING TESTS
     # ========================================================================
 
+    @requires_screen_session
     def f_test_zapping_standard(self):
         """
         Standard Zapping Test - Channel changing with default app.
         Sequence: HOME -> LIVE -> APP -> Channel UP/DOWN cycle
         """
-        self.f_log("=== STARTING STANDARD ZAPPING TEST ===")
-        
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
-        if not self.f_setup_logging("ZAPPING_STANDARD"):
-            return
-        duration = self.f_get_connection_info()
-        
-        if duration is None:
-            return
-        
-        if not self.f_initialize_device():
-            return
-        
-        initial_time = time.time()
-        self.error_already_shown = False
-        loop = 0
-        need_initial_sequence = True
-
-        try:
-            while time.time() - initial_time < duration:
-                
-                if need_initial_sequence:
-                    self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
-                    self.f_send_home_key(self.device)
-                    time.sleep(5)
-                    self.f_send_live_key(self.device)
-                    time.sleep(5)
-                    self.f_send_flow_key(self.device)
-                    need_initial_sequence = False
-                    self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
-                
-                reconnected = False
-                for func in [
-                           self.f_send_channelUP_key, self.f_send_channelUP_key, 
-                           self.f_send_channelDOWN_key, self.f_send_channelUP_key, 
-                           self.f_send_channelDOWN_key
-                           ]:
-                    
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                                    self.port, initial_time, duration)
-                    
-                    if reconnected:
-                        self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
-                        loop = 0
-                        need_initial_sequence = True
-                        break
-                
-                if not reconnected:
-                    loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
-
-        except Exception as e:
-            self.f_log(f"Execution terminated by fatal error: {e}")
-        
-        self.f_log(f"Standard Zapping Test of {duration} seconds completed.")
+        self._run_zapping("Standard", "ZAPPING_STANDARD",
+                          (self.f_send_home_key, self.f_send_live_key, self.f_send_flow_key),
+                          self.f_check_and_send)
 
+    @requires_screen_session
     def f_test_zapping_project1(self):
         """
         Project 1 Zapping Test -
         Sequence: HOME -> GUIDE -> Channel UP/DOWN cycle
         """
-        self.f_log("=== STARTING PROJECT 1 ZAPPING TEST ===")
-        
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
+        self._run_zapping("Project 1", "ZAPPING_PROJECT1",
+                          (self.f_send_home_key, self.f_send_guide_key,
+                           self.f_send_ok_key, self.f_send_back_key),
+                          self.f_check_and_send_project1)
+
+    def _run_zapping(self, name, log_tag, initial_steps, check_fn):
+        """
+        Zapping test body shared by all projects: initial sequence, then Channel UP/DOWN cycle.
+        
+        Args:
+            name (str): Test name used in log lines (ex: "Standard")
+            log_tag (str): Test name passed to f_setup_logging
+            initial_steps (tuple): Functions taking a device, run at start and after reconnection
+            check_fn: f_check_and_send variant used for the channel keys
+        """
+        self.f_log(f"=== STARTING {name.upper()} ZAPPING TEST ===")
         
-        if not self.f_setup_logging("ZAPPING_PROJECT1"):
+        if not self.f_setup_logging(log_tag):
             return
         duration = self.f_get_connection_info()
         
@@ -1067,55 +1764,54 @@ class STBTester:
         if not self.f_initialize_device():
             return
         
-        initial_time = time.time()
-        self.error_already_shown = False
+        deadline = self._start_deadline(duration)
         loop = 0
         need_initial_sequence = True
+        cycle = (self.f_send_channelUP_key, self.f_send_channelUP_key,
+                 self.f_send_channelDOWN_key, self.f_send_channelUP_key,
+                 self.f_send_channelDOWN_key)
 
         try:
-            while time.time() - initial_time < duration:
+            while not self._expired:
                 
                 if need_initial_sequence:
                     self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
-                    self.f_send_home_key(self.device)
-                    time.sleep(5)
-                    self.f_send_guide_key(self.device)
-                    time.sleep(5)
-                    self.f_send_ok_key(self.device)
-                    time.sleep(5)
-                    self.f_send_back_key(self.device)
+                    before = None
+                    for i, step in enumerate(initial_steps):
+                        if i:
+                            self.f_wait_focus_change(self.device, before)
+                        if i < len(initial_steps) - 1:
+                            before = self._current_focus(self.device)
+                        step(self.device)
                     need_initial_sequence = False
                     self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
                 
-                reconnected = False
-                for func in [
-                        self.f_send_channelUP_key, self.f_send_channelUP_key, 
-                        self.f_send_channelDOWN_key, self.f_send_channelUP_key, 
-                        self.f_send_channelDOWN_key
-                        ]:
-            
-                    self.device, reconnected = self.f_check_and_send_project1(func, self.device, self.ip, 
-                                            self.port, initial_time, duration)
+                for func in cycle:
                     
-                    if reconnected:
+                    if check_fn(func, deadline):
                         self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
                         loop = 0
                         need_initial_sequence = True
                         break
-                
-                if not reconnected:
+                else:
                     loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
+                    self.f_log("LOOP %d CONCLUDED", loop)
 
         except Exception as e:
             self.f_log(f"Execution terminated by fatal error: {e} (at loop {loop})")
+        finally:
+            self._stop_deadline()
+            self._end_session()
+
+        self.f_log(f"{name} Zapping Test of {duration} seconds completed.")
 
-        self.f_log(f"Project 1 Zapping Test of {duration} seconds completed.")
+        self.f_flush_log()
 
     # ========================================================================
     # NAVIGATION TESTS
     # ========================================================================
 
+    @requires_screen_session
     def f_test_navigation_project2(self):
         """
         Project 2 Navigation Test
@@ -1123,19 +1819,6 @@ class STBTester:
         """
         self.f_log("=== STARTING PROJECT 2 NAVIGATION TEST ===")
         
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
         if not self.f_setup_logging("NAVIGATION_PROJECT2"):
             return
         duration = self.f_get_connection_info()
@@ -1146,82 +1829,47 @@ class STBTester:
         if not self.f_initialize_device():
             return
         
-        initial_time = time.time()
-        self.error_already_shown = False
+        deadline = self._start_deadline(duration)
         loop = 0
         need_initial_sequence = True
         
+        steps = self._batch_steps(self._NAV_SEQ_P2)
+
         try:
-            while time.time() - initial_time < duration:
+            while not self._expired:
                 
                 if need_initial_sequence:
                     self.f_log("=== INITIAL SEQUENCE: Ready to start navigation ===")
                     need_initial_sequence = False
 
-                reconnected = False
-                for func in [
-                    self.f_send_home_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_up_key, self.f_send_up_key, self.f_send_up_key, self.f_send_up_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_ok_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_up_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_up_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_up_key, self.f_send_left_key, self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key,
-                ]:
+                for func in steps:
                     
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                                    self.port, initial_time, duration)
-                    
-                    if reconnected:
+                    if self.f_check_and_send(func, deadline):
                         self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
                         loop = 0
                         need_initial_sequence = True
                         break
-                
-                if not reconnected:
+                else:
                     loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
+                    self.f_log("LOOP %d CONCLUDED", loop)
                     
         except Exception as e:
             self.f_log(f"Execution terminated due to fatal error: {e}")
+        finally:
+            self._stop_deadline()
+            self._end_session()
         
         self.f_log(f"Project 2 Navigation Test of {duration} seconds completed.")
+        
+        self.f_flush_log()
 
+    @requires_screen_session
     def f_test_navigation_project1(self):
         """
         Project 1 Navigation Test - Interface navigation sequence.
         """
         self.f_log("=== STARTING PROJECT 1 NAVIGATION TEST ===")
         
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
         if not self.f_setup_logging("NAVIGATION_PROJECT1"):
             return
         duration = self.f_get_connection_info()
@@ -1232,13 +1880,14 @@ class STBTester:
         if not self.f_initialize_device():
             return
         
-        initial_time = time.time()
-        self.error_already_shown = False
+        deadline = self._start_deadline(duration)
         loop = 0
         need_initial_sequence = True
 
+        steps = self._batch_steps(self._NAV_SEQ_P1)
+
         try:
-            while time.time() - initial_time < duration:
+            while not self._expired:
                 
                 if need_initial_sequence:
                     self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
@@ -1246,69 +1895,34 @@ class STBTester:
                     need_initial_sequence = False
                     self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
                 
-                reconnected = False
-                for func in [
-                    self.f_send_home_key, 
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_up_key, self.f_send_up_key, self.f_send_up_key, self.f_send_up_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_right_key,
-                    self.f_send_up_key, self.f_send_left_key, self.f_send_home_key,
-                    self.f_send_up_key, self.f_send_right_key, self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_up_key, self.f_send_up_key, self.f_send_up_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_home_key, self.f_send_up_key, self.f_send_right_key, self.f_send_right_key, self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_up_key, self.f_send_up_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_home_key
-                    ]:
-
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                                       self.port, initial_time, duration)
-
-                    if reconnected:
+                for func in steps:
+                    
+                    if self.f_check_and_send(func, deadline):
                         self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
                         loop = 0
                         need_initial_sequence = True
                         break
-                
-                if not reconnected:
+                else:
                     loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
+                    self.f_log("LOOP %d CONCLUDED", loop)
                     
         except Exception as e:
             self.f_log(f"Execution terminated due to fatal error: {e}")
+        finally:
+            self._stop_deadline()
+            self._end_session()
         
         self.f_log(f"Project 1 Navigation Test of {duration} seconds completed.")
+        
+        self.f_flush_log()
 
+    @requires_screen_session
     def f_test_navigation_project3(self):
         """
         Project 3 Navigation Test - Interface navigation sequence.
         """
         self.f_log("=== STARTING PROJECT 3 NAVIGATION TEST ===")
         
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
         if not self.f_setup_logging("NAVIGATION_PROJECT3"):
             return
         duration = self.f_get_connection_info()
@@ -1319,18 +1933,14 @@ class STBTester:
         if not self.f_initialize_device():
             return
         
-        initial_time = time.time()
-        self.error_already_shown = False
+        deadline = self._start_deadline(duration)
         loop = 0
         need_initial_sequence = True
         
-        def send_flow_with_navigation(device):
-            """Wrapper function to properly call flow_key in loop"""
-            time.sleep(5)
-            return self.f_send_flow_key(device)
+        steps = self._batch_steps(self._NAV_SEQ_P3)
 
         try:
-            while time.time() - initial_time < duration:
+            while not self._expired:
                 
                 if need_initial_sequence:
                     self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
@@ -1338,369 +1948,130 @@ class STBTester:
                     need_initial_sequence = False
                     self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
                 
-                reconnected = False
-                for func in [
-                   self.f_send_home_key, self.f_send_home_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_home_key, self.f_send_up_key, self.f_send_right_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_home_key, self.f_send_up_key, self.f_send_right_key, self.f_send_right_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_home_key,
-                    send_flow_with_navigation,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_back_key,
-                    self.f_send_right_key, 
-                    self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_down_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_up_key, self.f_send_up_key, self.f_send_up_key, self.f_send_up_key, self.f_send_up_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_back_key,
-                    self.f_send_right_key, self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_back_key,
-                    self.f_send_right_key, self.f_send_ok_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key, self.f_send_down_key, self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_back_key, self.f_send_ok_key,
-                    self.f_send_down_key, self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_down_key,
-                    self.f_send_right_key, self.f_send_right_key, self.f_send_right_key,
-                    self.f_send_back_key,
-                    self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key, self.f_send_left_key,
-                    self.f_send_ok_key
-                ]:
-                
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                            self.port, initial_time, duration)
-
-                    if reconnected:
+                for func in steps:
+                    
+                    if self.f_check_and_send(func, deadline):
                         self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
                         loop = 0
                         need_initial_sequence = True
                         break
-                
-                if not reconnected:
+                else:
                     loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
+                    self.f_log("LOOP %d CONCLUDED", loop)
                     
         except Exception as e:
             self.f_log(f"Execution terminated due to fatal error: {e}")
+        finally:
+            self._stop_deadline()
+            self._end_session()
         
         self.f_log(f"Project 3 Navigation Test of {duration} seconds completed.")
+        
+        self.f_flush_log()
 
     # ========================================================================
     # APPS TEST
     # ========================================================================
 
+    def _open_netflix(self, device):
+        """HOME, then open Netflix"""
+        self.f_send_home_key(device)
+        return self.f_open_app(device, "com.netflix.ninja", "Netflix")
+
+    def _open_amazon(self, device):
+        """HOME, then open Amazon Prime"""
+        self.f_send_home_key(device)
+        return self.f_open_app_secondary(device, "com.amazon.amazonvideo.livingroom", "Amazon Prime")
+
+    def _open_youtube(self, device):
+        """HOME, then open YouTube"""
+        self.f_send_home_key(device)
+        return self.f_open_app(device, "com.google.android.youtube.tv", "YouTube")
+
+    def _open_disney(self, device):
+        """HOME, then open Disney+"""
+        self.f_send_home_key(device)
+        return self.f_open_app(device, "com.disney.disneyplus", "Disney+")
+
+    def _open_spotify(self, device):
+        """HOME, then open Spotify"""
+        self.f_send_home_key(device)
+        return self.f_open_app(device, "com.spotify.tv.android", "Spotify")
+
+    def _open_max(self, device):
+        """HOME, then open Max"""
+        self.f_send_home_key(device)
+        return self.f_open_app_secondary(device, "com.wbd.stream", "Max")
+
+    @requires_screen_session
     def f_test_apps(self):
         """
         Apps Test - Open and close apps
         Cycle: HOME -> App -> HOME -> Next App
         Apps tested: Netflix, Amazon Prime, YouTube, Disney+, Spotify, Max
         """
-        self.f_log("=== STARTING APPS TEST ===")
-        
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
-        if not self.f_setup_logging("APPS"):
-            return
-        duration = self.f_get_connection_info()
-        
-        if duration is None:
-            return
-        
-        if not self.f_initialize_device():
-            return
-        
-        initial_time = time.time()
-        self.error_already_shown = False
-        loop = 0
-        need_initial_sequence = True
-        
-        def open_netflix(device):
-            self.f_send_home_key(device)
-            return self.f_open_app(device, "com.netflix.ninja", "Netflix")
-        
-        def open_amazon(device):
-            self.f_send_home_key(device)
-            return self.f_open_app_secondary(device, "com.amazon.amazonvideo.livingroom", "Amazon Prime")
-        
-        def open_youtube(device):
-            self.f_send_home_key(device)
-            return self.f_open_app(device, "com.google.android.youtube.tv", "YouTube")
-        
-        def open_disney(device):
-            self.f_send_home_key(device)
-            return self.f_open_app(device, "com.disney.disneyplus", "Disney+")
-        
-        def open_spotify(device):
-            self.f_send_home_key(device)
-            return self.f_open_app(device, "com.spotify.tv.android", "Spotify")
-        
-        def open_max(device):
-            self.f_send_home_key(device)
-            return self.f_open_app_secondary(device, "com.wbd.stream", "Max")
-        
-        try:
-            while time.time() - initial_time < duration:
-                
-                if need_initial_sequence:
-                    self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
-                    self.f_send_home_key(self.device)
-                    need_initial_sequence = False
-                    self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
-                
-                reconnected = False
-                for func in [
-                    open_netflix, open_amazon, open_youtube, 
-                    open_disney, open_spotify, open_max
-                ]:
-                
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                                    self.port, initial_time, duration)
-                    
-                    if reconnected:
-                        self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
-                        loop = 0
-                        need_initial_sequence = True
-                        break
-                
-                if not reconnected:
-                    loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
-            
-        except Exception as e:
-            self.f_log(f"Execution terminated due to fatal error: {e}")
-        
-        self.f_log(f"Apps Test of {duration} seconds completed.")
+        self._run_test("Apps", "APPS", self._apps_step)
+
+    def _apps_step(self, deadline):
+        """One apps test loop: open each app from HOME. Returns True on reconnection"""
+        check_and_send = self.f_check_and_send
+        for func in self._APP_OPENERS:
+            if check_and_send(func, deadline):
+                return True
+        return False
 
     # ========================================================================
     # VOLUME CONTROL TEST
     # ========================================================================
 
+    @requires_screen_session
     def f_test_volume_control(self):
         """
         Volume Control Test - Tests volume up, down and mute functionality.
         Sequence: HOME -> VOL_UP x5 -> VOL_DOWN x5 -> MUTE -> MUTE -> Repeat
         Compatible with any Android STB device.
         """
-        self.f_log("=== STARTING VOLUME CONTROL TEST ===")
-        
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("• Use: screen -S [SessionName]")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
-        if not self.f_setup_logging("VOLUME_CONTROL"):
-            return
-        duration = self.f_get_connection_info()
-        
-        if duration is None:
-            return
-        
-        if not self.f_initialize_device():
-            return
-        
-        initial_time = time.time()
-        self.error_already_shown = False
-        loop = 0
-        need_initial_sequence = True
+        self._run_test("Volume Control", "VOLUME_CONTROL", self._volume_step)
 
-        try:
-            while time.time() - initial_time < duration:
-                
-                if need_initial_sequence:
-                    self.f_log("=== EXECUTING INITIAL SEQUENCE ===")
-                    self.f_send_home_key(self.device)
-                    need_initial_sequence = False
-                    self.f_log("=== INITIAL SEQUENCE COMPLETED ===")
-                
-                reconnected = False
-                for func in [
-                    # Volume UP x5
-                    self.f_send_volume_up_key, self.f_send_volume_up_key,
-                    self.f_send_volume_up_key, self.f_send_volume_up_key,
-                    self.f_send_volume_up_key,
-                    # Volume DOWN x5
-                    self.f_send_volume_down_key, self.f_send_volume_down_key,
-                    self.f_send_volume_down_key, self.f_send_volume_down_key,
-                    self.f_send_volume_down_key,
-                    # MUTE toggle (on/off)
-                    self.f_send_mute_key,
-                    self.f_send_mute_key,
-                    # Volume UP x3
-                    self.f_send_volume_up_key, self.f_send_volume_up_key,
-                    self.f_send_volume_up_key,
-                    # Volume DOWN x3
-                    self.f_send_volume_down_key, self.f_send_volume_down_key,
-                    self.f_send_volume_down_key,
-                    # MUTE toggle (on/off)
-                    self.f_send_mute_key,
-                    self.f_send_mute_key,
-                ]:
-                
-                    self.device, reconnected = self.f_check_and_send(func, self.device, self.ip, 
-                                                    self.port, initial_time, duration)
-                    
-                    if reconnected:
-                        self.f_log("RECONNECTION DETECTED - RESTARTING TEST FROM BEGINNING")
-                        loop = 0
-                        need_initial_sequence = True
-                        break
-                
-                if not reconnected:
-                    loop += 1
-                    self.f_log(f"LOOP {loop} CONCLUDED")
-            
-        except Exception as e:
-            self.f_log(f"Execution terminated due to fatal error: {e}")
-        
-        self.f_log(f"Volume Control Test of {duration} seconds completed.")
+    def _volume_step(self, deadline):
+        """One volume test loop, whole cycle in one shell call. Returns True on reconnection"""
+        return self.f_check_and_send(self._volume_cycle, deadline)
 
     # ========================================================================
     # STANDBY/WAKEUP TEST
     # ========================================================================
 
+    @requires_screen_session
     def f_test_standby_wakeup(self):
         """
         Standby/Wakeup Test - Standby and wake-up cycle.
         Sequence: STANDBY (10s delay) -> WAKEUP (20s delay) -> Repeat
         """
-        self.f_log("=== STARTING STANDBY/WAKEUP TEST ===")
-        
-        if not os.getenv("STY"):
-            print("\n" + "="*60)
-            print("SCREEN SESSION REQUIRED")
-            print("="*60)
-            print("• This script must be executed within a 'screen' session")
-            print("="*60)
-            print("Returning to menu in 10 seconds...")
-            print("="*60)
-            time.sleep(10)
-            os.system("cls" if os.name == "nt" else "clear")
-            return
-        
-        if not self.f_setup_logging("STANDBY_WAKEUP"):
-            return
-        duration = self.f_get_connection_info()
-        
-        if duration is None:
-            return
-        
-        if not self.f_initialize_device():
-            return
-        
-        initial_time = time.time()
-        self.error_already_shown = False
-        loop = 0
-        need_initial_sequence = True
-    
-        try:
-            while time.time() - initial_time < duration:
-                
-                if need_initial_sequence:
-                    self.f_log("=== INITIAL SEQUENCE: Ready to start standby/wakeup cycle ===")
-                    need_initial_sequence = False
-                
-                if not self.f_send_standby_key(self.device):
-                    self.device, reconnected = self.f_reconnect_and_reinitialize(
-                        self.ip, self.port, initial_time, duration)
-                    loop = 0
-                    need_initial_sequence = True
-                    continue
-                
-                if not self.f_send_wake_up_key(self.device):
-                    self.device, reconnected = self.f_reconnect_and_reinitialize(
-                        self.ip, self.port, initial_time, duration)
-                    loop = 0
-                    need_initial_sequence = True
-                    continue
-                
-                loop += 1
-                self.f_log(f"LOOP {loop} CONCLUDED")
-            
-        except Exception as e:
-            self.f_log(f"Execution terminated due to fatal error: {e}")
-        
-        self.f_log(f"Standby/Wakeup Test of {duration} seconds completed.")
+        self._run_test("Standby/Wakeup", "STANDBY_WAKEUP", self._standby_step,
+                       self._standby_initial, log_restart=False)
+
+    def _standby_initial(self):
+        """Standby/wakeup test start - no keys needed before the cycle"""
+        self.f_log("=== INITIAL SEQUENCE: Ready to start standby/wakeup cycle ===")
+
+    def _standby_step(self, deadline):
+        """One standby/wakeup cycle. Returns True on reconnection"""
+        if self.f_send_standby_key(self.device) and self.f_send_wake_up_key(self.device):
+            return False
+        self.f_reconnect_and_reinitialize(deadline)
+        return True
 
 # ============================================================================
 # MAIN PROGRAM FUNCTIONS
 # ============================================================================
 
 def f_show_menu():
-    if not os.getenv("STY"):
-        print("\n This script MUST be executed within a 'screen' session")
-        print("\n  Use: screen -S [SessionName]\n")
+    if not _IN_SCREEN:
+        print("\n This script MUST be executed within a 'screen' session\n"
+              "\n  Use: screen -S [SessionName]\n")
         sys.exit(1)
     
-    os.system("cls" if os.name == "nt" else "clear")
-    print("\n" + "="*50)
-    print("STB TEST SUITE - SELECT PROJECT")
-    print("="*50)
-    print("1 - Project 1")
-    print("2 - Project 2")
-    print("3 - Project 3")
-    print("0 - Exit (quit)")
-    print("="*50)
+    _write_raw(_MAIN_MENU)
 
 def f_main():
     """
@@ -1712,21 +2083,17 @@ def f_main():
     while True:
         f_show_menu()
         try:
-            option = input("Choose an option: ").strip()
+            option = _prompt("Choose an option: ")
             
-            if option == "1":
-                tester.f_menu_project1()
-            elif option == "2":
-                tester.f_menu_project2()
-            elif option == "3":
-                tester.f_menu_project3()
+            if option in ("1", "2", "3"):
+                tester.f_menu_project(int(option))
             elif option == "0":
                 print("Closing STB Test Suite...")
                 break
             else:
                 print("Invalid option!!! Choose a valid option.")
                 time.sleep(1)
-                os.system("cls" if os.name == "nt" else "clear")
+                _clear()
                 
         except KeyboardInterrupt:
             print("\n\n Program interrupted by user.")